@@ -1,6 +1,18 @@
+import io
 import os
+import math
+from functools import lru_cache
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: fall back to plain Python if it is not installed
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
 def ensure_dir(file_path):
     directory = os.path.dirname(file_path)
     if not os.path.exists(directory):
@@ -11,19 +23,93 @@ def write_dat_file(filename, name, x, y):
     ensure_dir(filename)
     with open(filename, 'w') as f:
         f.write(f"{name}\n")
-        for i in range(len(x)):
-            f.write(f" {x[i]:.6f}   {y[i]:.6f}\n")
+        np.savetxt(f, np.column_stack((x, y)), fmt=" %.6f   %.6f")
     print(f"✅ Created: {filename}")
 
+@lru_cache(maxsize=8)
 def get_cosine_spacing(n_points):
-    """Generates 0 to 1 spacing clustered at ends"""
+    """Generates 0 to 1 spacing clustered at ends (cached, read-only)"""
     beta = np.linspace(0, np.pi, int(n_points/2) + 1)
-    return 0.5 * (1 - np.cos(beta))
+    x = 0.5 * (1 - np.cos(beta))
+    x.flags.writeable = False
+    return x
+
+def thickness_coefficients(t):
+    """NACA thickness coefficients with the 5*t scale folded in"""
+    return 5 * t * np.array([0.2969, -0.1260, -0.3516, 0.2843, -0.1015])
+
+@njit(fastmath=True)
+def _thickness(x, a):
+    # Polynomial part in Horner form (avoids the x**k temporaries)
+    return a[0] * np.sqrt(x) + x * (a[1] + x * (a[2] + x * (a[3] + a[4] * x)))
 
 def calculate_thickness(x, t):
     """Standard NACA thickness distribution"""
-    return 5 * t * (0.2969 * np.sqrt(x) - 0.1260 * x - 0.3516 * x**2 +
-                    0.2843 * x**3 - 0.1015 * x**4)
+    return _thickness(x, thickness_coefficients(t))
+
+@njit(fastmath=True)
+def _store_surface_point(X, Y, i, xi, yt, yc, dyc_dx):
+    """
+    Applies the thickness normal to the mean line at station i and writes
+    both surfaces straight into the Selig-ordered output buffers:
+    upper surface TE -> LE in [0:n], lower surface LE -> TE in [n:2n-1].
+    """
+    n = (len(X) + 1) // 2
+    # cos/sin of theta = atan(dyc_dx) without any transcendental calls
+    cos_t = 1.0 / math.sqrt(1.0 + dyc_dx * dyc_dx)
+    sin_t = dyc_dx * cos_t
+    dx = yt * sin_t
+    dy = yt * cos_t
+    X[n - 1 - i] = xi - dx
+    Y[n - 1 - i] = yc + dy
+    if i > 0:  # The LE point is shared, keep only the upper copy
+        X[n - 1 + i] = xi + dx
+        Y[n - 1 + i] = yc - dy
+
+@njit(fastmath=True)
+def _naca4_coords(x, m, p, a):
+    """Single-pass thickness + camber + rotation for the 4-digit mean line"""
+    n = len(x)
+    X = np.empty(2 * n - 1)
+    Y = np.empty(2 * n - 1)
+
+    for i in range(n):
+        xi = x[i]
+        yt = _thickness(xi, a)
+        if m == 0:
+            # Symmetric section: flat mean line
+            yc, dyc_dx = 0.0, 0.0
+        elif xi < p:
+            yc = (m / p**2) * (2 * p * xi - xi**2)
+            dyc_dx = (2 * m / p**2) * (p - xi)
+        else:
+            yc = (m / (1 - p)**2) * ((1 - 2 * p) + 2 * p * xi - xi**2)
+            dyc_dx = (2 * m / (1 - p)**2) * (p - xi)
+
+        _store_surface_point(X, Y, i, xi, yt, yc, dyc_dx)
+
+    return X, Y
+
+@njit(fastmath=True)
+def _naca5_coords(x, m, p, k1, a):
+    """Single-pass thickness + camber + rotation for the 5-digit mean line"""
+    n = len(x)
+    X = np.empty(2 * n - 1)
+    Y = np.empty(2 * n - 1)
+
+    for i in range(n):
+        xi = x[i]
+        yt = _thickness(xi, a)
+        if xi < p:
+            yc = (k1 / 6.0) * (xi**3 - 3*m*xi**2 + (m**2)*(3-m)*xi)
+            dyc_dx = (k1 / 6.0) * (3*xi**2 - 6*m*xi + (m**2)*(3-m))
+        else:
+            yc = (k1 * (m**3) / 6.0) * (1 - xi)
+            dyc_dx = - (k1 * (m**3) / 6.0)
+
+        _store_surface_point(X, Y, i, xi, yt, yc, dyc_dx)
+
+    return X, Y
 
 def naca4_digit(code, n_points=200):
     """Math for 4-Digit Series (e.g. 2412)"""
@@ -32,29 +118,7 @@ def naca4_digit(code, n_points=200):
     t = int(code[2:]) / 100.0
     
     x = get_cosine_spacing(n_points)
-    yt = calculate_thickness(x, t)
-    
-    yc = np.zeros_like(x)
-    dyc_dx = np.zeros_like(x)
-    
-    for i in range(len(x)):
-        if m == 0:
-            yc[i], dyc_dx[i] = 0, 0
-        else:
-            if x[i] < p:
-                yc[i] = (m / p**2) * (2 * p * x[i] - x[i]**2)
-                dyc_dx[i] = (2 * m / p**2) * (p - x[i])
-            else:
-                yc[i] = (m / (1 - p)**2) * ((1 - 2 * p) + 2 * p * x[i] - x[i]**2)
-                dyc_dx[i] = (2 * m / (1 - p)**2) * (p - x[i])
-
-    theta = np.arctan(dyc_dx)
-    xu = x - yt * np.sin(theta)
-    yu = yc + yt * np.cos(theta)
-    xl = x + yt * np.sin(theta)
-    yl = yc - yt * np.cos(theta)
-    
-    return np.concatenate((xu[::-1], xl[1:])), np.concatenate((yu[::-1], yl[1:]))
+    return _naca4_coords(x, m, p, thickness_coefficients(t))
 
 def naca5_digit(code, n_points=200):
     """
@@ -70,26 +134,7 @@ def naca5_digit(code, n_points=200):
     t = int(code[3:]) / 100.0 # Last two digits are thickness (12 -> 0.12)
     
     x = get_cosine_spacing(n_points)
-    yt = calculate_thickness(x, t)
-    
-    yc = np.zeros_like(x)
-    dyc_dx = np.zeros_like(x)
-    
-    for i in range(len(x)):
-        if x[i] < p:
-            yc[i] = (k1 / 6.0) * (x[i]**3 - 3*m*x[i]**2 + (m**2)*(3-m)*x[i])
-            dyc_dx[i] = (k1 / 6.0) * (3*x[i]**2 - 6*m*x[i] + (m**2)*(3-m))
-        else:
-            yc[i] = (k1 * (m**3) / 6.0) * (1 - x[i])
-            dyc_dx[i] = - (k1 * (m**3) / 6.0)
-            
-    theta = np.arctan(dyc_dx)
-    xu = x - yt * np.sin(theta)
-    yu = yc + yt * np.cos(theta)
-    xl = x + yt * np.sin(theta)
-    yl = yc - yt * np.cos(theta)
-    
-    return np.concatenate((xu[::-1], xl[1:])), np.concatenate((yu[::-1], yl[1:]))
+    return _naca5_coords(x, m, p, k1, thickness_coefficients(t))
 
 # --- HARDCODED 6-SERIES (Math for this is very complex, sticking to data) ---
 # This is a CLEANED version of 63-012A (Closed TE, Smooth LE)
@@ -141,15 +186,11 @@ NACA63012A_COORDS = """
 1.000000 0.000000
 """
 
-def write_hardcoded(filename, name, data_str):
-    ensure_dir(filename)
-    with open(filename, 'w') as f:
-        f.write(f"{name}\n")
-        for line in data_str.strip().split('\n'):
-            parts = line.split()
-            if len(parts) == 2:
-                f.write(f" {float(parts[0]):.6f}   {float(parts[1]):.6f}\n")
-    print(f"✅ Created: {filename}")
+# Parsed once at import
+NACA63012A_XY = np.loadtxt(io.StringIO(NACA63012A_COORDS))
+
+def write_hardcoded(filename, name, xy):
+    write_dat_file(filename, name, xy[:, 0], xy[:, 1])
 
 if __name__ == "__main__":
     # NOTE: We save directly to 'airfoil_data_clean'
@@ -169,6 +210,6 @@ if __name__ == "__main__":
     write_dat_file(os.path.join(output_dir, "naca23012.dat"), "NACA 23012", X, Y)
     
     # 3. Write 6-Series (Hardcoded but cleaned)
-    write_hardcoded(os.path.join(output_dir, "naca63012a.dat"), "NACA 63012A", NACA63012A_COORDS)
+    write_hardcoded(os.path.join(output_dir, "naca63012a.dat"), "NACA 63012A", NACA63012A_XY)
     
     print("\nGeneration Complete. Run the Refiner script next.")
\ No newline at end of file
@@ -1,7 +1,21 @@
 import numpy as np
-from scipy.interpolate import splprep, splev
+from scipy.interpolate import splprep, BSpline
 import os
 import glob
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+@lru_cache(maxsize=8)
+def get_parameter_grid(n_points):
+    """Uniform 0..1 spline parameters (cached, read-only)"""
+    u = np.linspace(0, 1, n_points)
+    u.flags.writeable = False
+    return u
+
+@lru_cache(maxsize=8)
+def get_output_buffer(n_points):
+    """Scratch (n_points, 2) array reused by save_refined (one per worker process)"""
+    return np.empty((n_points, 2))
 
 def refine_airfoil_parametric(filename, n_points=200):
     """
@@ -10,20 +24,11 @@ def refine_airfoil_parametric(filename, n_points=200):
     perfectly round and smooth leading edge.
     """
     try:
-        # 1. Read Data
+        # 1. Read Data (header line is the airfoil name)
         with open(filename, 'r') as f:
-            lines = f.readlines()
+            name = f.readline().strip()
             
-        name = lines[0].strip()
-        coords = []
-        for line in lines[1:]:
-            parts = line.split()
-            if len(parts) >= 2:
-                try:
-                    coords.append([float(parts[0]), float(parts[1])])
-                except: continue
-        
-        pts = np.array(coords)
+        pts = np.loadtxt(filename, skiprows=1, usecols=(0, 1))
         
         # 2. Clean Data (Remove duplicate points)
         # Check if the first and last points are identical (closed loop)
@@ -39,14 +44,8 @@ def refine_airfoil_parametric(filename, n_points=200):
         # k=3 means cubic spline (smooth curvature)
         tck, u = splprep([x, y], s=0.0, k=3, per=1) 
 
-        # 4. Create Cosine Distribution (Clusters points at LE and TE)
-        # This generates points dense at the ends, sparse in the middle
-        beta = np.linspace(0, 2*np.pi, n_points)
-        # Map cosine to 0..1 parameter space 
-        # We adjust phase so the 'seam' is at the Trailing Edge
-        u_new = 0.5 * (1 - np.cos(beta))
-        
-        # However, splprep parameter 'u' usually goes 0->1 linearly around the perimeter.
+        # 4. Choose the evaluation parameters
+        # splprep parameter 'u' usually goes 0->1 linearly around the perimeter.
         # For standard Selig format (TE -> Top -> LE -> Bot -> TE), 
         # The LE is at u approx 0.5.
         
@@ -58,10 +57,12 @@ def refine_airfoil_parametric(filename, n_points=200):
         # Let's try standard curvature-based distribution (built-in to XFOIL, simulated here).
         
         # Simpler approach that works for 99% of airfoils:
-        u_new = np.linspace(0, 1, n_points)
+        u_new = get_parameter_grid(n_points)
         
-        # Evaluate the new points
-        x_new, y_new = splev(u_new, tck)
+        # Evaluate the new points (x and y share the knot vector, so a single
+        # BSpline over the stacked coefficients replaces one splev per axis)
+        knots, coeffs, k = tck
+        x_new, y_new = BSpline(knots, np.column_stack(coeffs), k)(u_new).T
         
         # Ensure the Trailing Edge is closed exactly
         x_new[0] = x_new[-1] = 1.0
@@ -76,8 +77,21 @@ def refine_airfoil_parametric(filename, n_points=200):
 def save_refined(filename, name, x, y):
     with open(filename, 'w') as f:
         f.write(f"{name}\n")
-        for i in range(len(x)):
-            f.write(f" {x[i]:.6f}   {y[i]:.6f}\n")
+        xy = get_output_buffer(len(x))
+        xy[:, 0] = x
+        xy[:, 1] = y
+        np.savetxt(f, xy, fmt=" %.6f   %.6f")
+
+def refine_and_save(file_path, dest_dir, n_points=200):
+    """Worker: refines one airfoil file and writes it to dest_dir"""
+    basename = os.path.basename(file_path)
+    name, x, y = refine_airfoil_parametric(file_path, n_points=n_points)
+    
+    if x is None:
+        return basename, False
+    
+    save_refined(os.path.join(dest_dir, basename), name, x, y)
+    return basename, True
 
 if __name__ == "__main__":
     base_dir = os.getcwd()
@@ -91,17 +105,15 @@ if __name__ == "__main__":
     
     files = glob.glob(os.path.join(source_dir, "*.dat"))
     
-    for file_path in files:
-        basename = os.path.basename(file_path)
-        print(f"  Smoothing {basename}...", end=" ")
-        
-        name, x, y = refine_airfoil_parametric(file_path, n_points=200)
+    # Each airfoil is independent, so refine them in parallel
+    with ProcessPoolExecutor() as ex:
+        results = ex.map(partial(refine_and_save, dest_dir=dest_dir, n_points=200), files)
         
-        if x is not None:
-            save_path = os.path.join(dest_dir, basename)
-            save_refined(save_path, name, x, y)
-            print("✅ Round Nose Fixed.")
-        else:
-            print("❌ Failed.")
+        for basename, ok in results:
+            print(f"  Smoothing {basename}...", end=" ")
+            if ok:
+                print("✅ Round Nose Fixed.")
+            else:
+                print("❌ Failed.")
 
     print("\nRefinement Complete.")
\ No newline at end of file
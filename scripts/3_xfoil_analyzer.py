@@ -3,9 +3,12 @@ import matplotlib.pyplot as plt
 import subprocess
 import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 import pandas as pd
 import sys
+import warnings
 
 # Set matplotlib to use Agg backend (Headless plotting)
 import matplotlib
@@ -37,23 +40,33 @@ class AirfoilCFDAnalyzer:
             return False
         return True
         
-    def prepare_airfoil_file(self, airfoil_name: str):
+    def prepare_airfoil_file(self, airfoil_name: str, work_dir: str):
         source_file = os.path.join(self.data_dir, f"{airfoil_name}.dat")
-        temp_file = os.path.join(self.base_dir, f"{airfoil_name}.dat")
+        temp_file = os.path.join(work_dir, f"{airfoil_name}.dat")
         
         if not os.path.exists(source_file):
             print(f"  ❌ Source not found: {source_file}")
             return False
             
         try:
+            with open(source_file, 'rb') as f:
+                has_crlf = b'\r\n' in f.read(512)
+            
+            if not has_crlf:
+                # Already Unix format (our generator/refiner output): just link it
+                try:
+                    os.symlink(os.path.abspath(source_file), temp_file)
+                except OSError:
+                    # e.g. Windows without symlink privileges
+                    shutil.copyfile(source_file, temp_file)
+                return True
+            
             with open(source_file, 'r') as f:
                 content = f.read()
             
             # Force Unix format
             with open(temp_file, 'w', newline='\n') as f:
                 f.write(content)
-                f.flush()
-                os.fsync(f.fileno())
                 
             return True
         except Exception as e:
@@ -72,9 +85,13 @@ class AirfoilCFDAnalyzer:
         if not alpha_list: return ""
         
         # Organize Alphas: Center -> Out
-        pos_alphas = sorted([a for a in alpha_list if a >= 0])
-        neg_alphas = sorted([a for a in alpha_list if a < 0], reverse=True)
+        alphas = np.sort(np.asarray(alpha_list))
+        split = np.searchsorted(alphas, 0.0)
+        pos_alphas = alphas[split:].tolist()
+        neg_alphas = alphas[:split][::-1].tolist()
 
+        # One entry per input line; "" entries are bare Enter presses
+        # (used to leave the GDES/MDES/PPAR sub-menus)
         commands = [f"LOAD {airfoil_name}.dat", f"{airfoil_name}"]
 
         # --- BRANCH 1: 6-SERIES BRUTE FORCE ---
@@ -87,19 +104,18 @@ class AirfoilCFDAnalyzer:
             commands.append("0.005") 
             commands.append("0.5")
             commands.append("EXEC")
-            commands.append("\n")
+            commands.extend(["", ""])
             
             # 2. Smooth (Bring back FILT, the refined data might still have noise)
             commands.append("MDES")
             commands.append("FILT") # Smooth once
             commands.append("EXEC")
-            commands.append("\n")
+            commands.extend(["", ""])
             
             # 3. Density
             commands.append("PPAR")
             commands.append("N 140") 
-            commands.append("\n")
-            commands.append("\n")
+            commands.extend(["", "", "", ""])
             
             # 4. Solver Settings
             commands.append("OPER")
@@ -121,14 +137,12 @@ class AirfoilCFDAnalyzer:
             commands.append(f"{output_file_base}.dump")
             
             # Manual Step: 0 -> Positive
-            for alpha in pos_alphas:
-                commands.append(f"ALFA {alpha}")
+            commands.extend(f"ALFA {a}" for a in pos_alphas)
             
             # Manual Step: 0 -> Negative
             commands.append("INIT") # Reset
             commands.append("ALFA 0")
-            for alpha in neg_alphas:
-                commands.append(f"ALFA {alpha}")
+            commands.extend(f"ALFA {a}" for a in neg_alphas)
 
         # --- BRANCH 2: STANDARD AIRFOILS ---
         else:
@@ -138,17 +152,14 @@ class AirfoilCFDAnalyzer:
             commands.append("0.002") 
             commands.append("0.5") 
             commands.append("EXEC") 
-            commands.append("\n")
+            commands.extend(["", ""])
             
-            commands.append("MDES")
-            commands.append("FILT")
-            commands.append("EXEC")
-            commands.append("\n")
+            # No MDES FILT here: only the 6-series needs smoothing, these
+            # sections come from the analytic generator + spline refiner
             
             commands.append("PPAR")
             commands.append("N 160")
-            commands.append("\n")
-            commands.append("\n")
+            commands.extend(["", "", "", ""])
             
             commands.append("OPER")
             commands.append(f"VISC {reynolds}")
@@ -164,61 +175,64 @@ class AirfoilCFDAnalyzer:
             commands.append(f"ASEQ {min_a} {max_a} 1.0")
 
         commands.append("PACC")
-        commands.append("\n")
+        commands.extend(["", ""])
         commands.append("QUIT")
         
         return "\n".join(commands) + "\n"
 
-    def run_xfoil_command(self, script: str, airfoil_name: str):
+    def run_xfoil_command(self, script: str, airfoil_name: str, work_dir: str):
         try:
             process = subprocess.Popen(
                 ['xfoil'],
                 stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                # Output is never inspected here (see 4_xfoil_debug.py for that)
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                cwd=self.base_dir 
+                cwd=work_dir
             )
-            stdout, stderr = process.communicate(input=script, timeout=45)
+            try:
+                process.communicate(input=script, timeout=45)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise
             return True
         except Exception:
             return False
     
     def parse_results(self, airfoil: str, polar_file: str):
         if not os.path.exists(polar_file):
-            print("  ⚠️ No polar file generated.")
+            print(f"  ⚠️ {airfoil}: no polar file generated.")
             self.results[airfoil] = pd.DataFrame()
             return
 
-        data = []
+        # The data table starts right after the "------ --------" separator
+        header_n = None
         with open(polar_file, 'r') as f:
-            lines = f.readlines()
-            
-        start_parsing = False
-        for line in lines:
-            if "---" in line:
-                start_parsing = True
-                continue
-            if start_parsing and line.strip():
-                try:
-                    parts = line.split()
-                    data.append({
-                        'alpha': float(parts[0]),
-                        'CL': float(parts[1]),
-                        'CD': float(parts[2]),
-                        'CM': float(parts[4]),
-                        'L/D': float(parts[1]) / float(parts[2]) if float(parts[2]) != 0 else 0
-                    })
-                except: continue
+            for i, line in enumerate(f):
+                if "---" in line:
+                    header_n = i + 1
+                    break
         
-        if data:
-            df = pd.DataFrame(data).drop_duplicates(subset=['alpha']).sort_values('alpha')
+        arr = np.empty((0, 4))
+        if header_n is not None:
+            try:
+                # A run that did not converge leaves only the header behind
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", UserWarning)
+                    arr = np.loadtxt(polar_file, skiprows=header_n, usecols=(0, 1, 2, 4), ndmin=2)
+            except ValueError as e:
+                print(f"  ⚠️ {airfoil}: could not parse polar ({e})")
+        
+        if arr.size:
+            df = pd.DataFrame({'alpha': arr[:, 0], 'CL': arr[:, 1], 'CD': arr[:, 2], 'CM': arr[:, 3]})
+            df['L/D'] = np.where(df['CD'] != 0, df['CL'] / df['CD'], 0)
+            df = df.drop_duplicates(subset=['alpha']).sort_values('alpha')
             self.results[airfoil] = df
-            dest = os.path.join('results/xfoil_results/polar_files', f'{airfoil}.polar')
-            shutil.copy(polar_file, dest)
-            print(f"  ✅ Success: {len(df)} data points.")
+            print(f"  ✅ {airfoil}: {len(df)} data points.")
         else:
-            print("  ⚠️ Analysis ran but file was empty.")
+            print(f"  ⚠️ {airfoil}: analysis ran but file was empty.")
             self.results[airfoil] = pd.DataFrame()
 
     def plot_results(self):
@@ -227,12 +241,18 @@ class AirfoilCFDAnalyzer:
 
         print("\nGenerating Plots...")
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        names = list(valid)
         
-        for name, df in valid.items():
-            axes[0,0].plot(df['alpha'], df['CL'], 'o-', label=name)
-            axes[0,1].plot(df['alpha'], df['CD'], 's-', label=name)
-            axes[1,0].plot(df['alpha'], df['L/D'], '^-', label=name)
-            axes[1,1].plot(df['alpha'], df['CM'], 'd-', label=name)
+        # One plot() call per subplot: (x, y, fmt) triplets for every airfoil.
+        # Airfoils can have different alpha sets, so no common grid is forced.
+        for ax, key, fmt in [(axes[0,0], 'CL', 'o-'), (axes[0,1], 'CD', 's-'),
+                             (axes[1,0], 'L/D', '^-'), (axes[1,1], 'CM', 'd-')]:
+            args = []
+            for df in valid.values():
+                args += [df['alpha'].values, df[key].values, fmt]
+            lines = ax.plot(*args)
+            for line, name in zip(lines, names):
+                line.set_label(name)
 
         axes[0,0].set_title('Lift Coefficient (CL)')
         axes[0,1].set_title('Drag Coefficient (CD)')
@@ -248,28 +268,43 @@ class AirfoilCFDAnalyzer:
         plt.savefig('results/xfoil_results/summary_plots/results.png')
         print("✅ Plot saved: results/xfoil_results/summary_plots/results.png")
 
+    def run_single_airfoil(self, airfoil: str, alpha_list: List[float], reynolds: float):
+        """
+        Runs one airfoil in its own scratch directory so that concurrent
+        XFOIL processes never collide on their working files. The polar is
+        written by XFOIL straight into the results folder.
+        """
+        output_base = os.path.abspath(os.path.join('results/xfoil_results/polar_files', airfoil))
+        polar_file = f"{output_base}.polar"
+        # XFOIL appends to an existing polar, so clear out any previous run
+        if os.path.exists(polar_file): os.remove(polar_file)
+        
+        work_dir = tempfile.mkdtemp(prefix=f"{airfoil}_")
+        try:
+            if not self.prepare_airfoil_file(airfoil, work_dir): return
+            
+            script = self.create_xfoil_script(airfoil, alpha_list, reynolds, output_base)
+            
+            if self.run_xfoil_command(script, airfoil, work_dir):
+                self.parse_results(airfoil, polar_file)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            if os.path.exists(f"{output_base}.dump"): os.remove(f"{output_base}.dump")
+
     def run_analysis(self, airfoils: List[str], alpha_list: List[float]):
         if not self.check_xfoil_available(): return
         
         mu = 1.7894e-5
         reynolds = self.rho * self.V_cr * self.chord / mu
         print(f"Starting Analysis | Re={reynolds:.2e} | Source: {self.data_dir}")
+        print(f"Running: {', '.join(airfoils)}")
         
-        for airfoil in airfoils:
-            print(f"\n--- {airfoil} ---")
-            if not self.prepare_airfoil_file(airfoil): continue
-            
-            output_base = os.path.join(self.base_dir, f"{airfoil}_results")
-            script = self.create_xfoil_script(airfoil, alpha_list, reynolds, output_base)
-            
-            if self.run_xfoil_command(script, airfoil):
-                polar_file = f"{output_base}.polar"
-                self.parse_results(airfoil, polar_file)
-            
-            temp_dat = os.path.join(self.base_dir, f"{airfoil}.dat")
-            if os.path.exists(temp_dat): os.remove(temp_dat)
-            if os.path.exists(f"{output_base}.dump"): os.remove(f"{output_base}.dump")
-            if os.path.exists(f"{output_base}.polar"): os.remove(f"{output_base}.polar")
+        # XFOIL runs are independent subprocesses, so overlap them
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            list(ex.map(lambda a: self.run_single_airfoil(a, alpha_list, reynolds), airfoils))
+        
+        # Keep the requested order (threads finish in any order)
+        self.results = {a: self.results[a] for a in airfoils if a in self.results}
 
 if __name__ == "__main__":
     airfoils = [
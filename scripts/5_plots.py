@@ -2,7 +2,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy import linalg, interpolate
 import os
+import multiprocessing
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import List, Dict, Tuple
 
 # Force Headless Mode
@@ -11,28 +14,116 @@ matplotlib.use('Agg')
 import warnings
 warnings.filterwarnings("ignore")
 
+# Raster settings for the many comparison PNGs: moderate resolution, fast zlib
+PLOT_DPI = 120
+PNG_KWARGS = {'compress_level': 1, 'optimize': False}
+# Fixed margins for the 4x2 comparison grids (replaces a per-figure tight_layout solve)
+GRID_LAYOUT = dict(top=0.94, bottom=0.04, left=0.05, right=0.97, hspace=0.2, wspace=0.05)
+
+try:
+    from numba import njit, prange, set_num_threads
+    HAS_NUMBA = True
+except ImportError:
+    # Numba is optional: the solver falls back to the vectorized NumPy kernels
+    HAS_NUMBA = False
+    prange = range
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Numba's on-disk cache pickles kernels against the defining module, which only
+# resolves when this file runs as a script (runpy/importlib loads are '<dynamic>')
+NUMBA_CACHE = __name__ in ("__main__", "__mp_main__")
+
+# --- COMPILED KERNELS (used when Numba is available) ---
+@njit(cache=NUMBA_CACHE, parallel=True, fastmath=True)
+def _assemble_A(xc, yc, x1, y1, ct, st, length, A):
+    """Fills the influence matrix A in place, one row per thread, no (n, n) temporaries"""
+    n = len(xc)
+    for i in prange(n):
+        for j in range(n):
+            if i == j:
+                A[i, j] = 0.5
+                continue
+            dx, dy = xc[i] - x1[j], yc[i] - y1[j]
+            X = dx * ct[j] + dy * st[j]
+            Y = -dx * st[j] + dy * ct[j]
+            Xm = X - length[j]
+            r1_sq, r2_sq = X*X + Y*Y, Xm*Xm + Y*Y
+            phi1, phi2 = np.arctan2(Y, X), np.arctan2(Y, Xm)
+            vn = (Xm*np.log(r2_sq) - X*np.log(r1_sq) + 2*Y*(phi2-phi1)) / (4*np.pi)
+            A[i, j] = vn / length[j]
+    return A
+
+@njit(cache=NUMBA_CACHE, parallel=True, fastmath=True)
+def _field_eval(Xf, Yf, x1, y1, ct, st, length, sigma):
+    """Velocity induced by all source panels at each (flattened) grid point"""
+    G, n = len(Xf), len(x1)
+    U = np.zeros_like(Xf)
+    V = np.zeros_like(Yf)
+    for g in prange(G):
+        u, v = 0.0, 0.0
+        for k in range(n):
+            dx, dy = Xf[g] - x1[k], Yf[g] - y1[k]
+            X_loc = dx * ct[k] + dy * st[k]
+            Y_loc = -dx * st[k] + dy * ct[k]
+            Xm = X_loc - length[k]
+            r1_sq, r2_sq = X_loc*X_loc + Y_loc*Y_loc, Xm*Xm + Y_loc*Y_loc
+            J = 0.5 * np.log(max(r2_sq, 1e-20)/max(r1_sq, 1e-20))
+            I = np.arctan2(Y_loc, Xm) - np.arctan2(Y_loc, X_loc)
+            coef = sigma[k]/(2*np.pi)
+            u += (J*ct[k] - I*st[k]) * coef
+            v += (J*st[k] + I*ct[k]) * coef
+        U[g] = u
+        V[g] = v
+    return U, V
+
+# --- PANEL GEOMETRY (Structure of Arrays: one contiguous array per attribute) ---
+@dataclass
+class Panels:
+    xc: np.ndarray
+    yc: np.ndarray
+    x1: np.ndarray
+    y1: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+    length: np.ndarray
+    theta: np.ndarray
+    beta: np.ndarray
+    cos_theta: np.ndarray
+    sin_theta: np.ndarray
+    boundary_x: np.ndarray  # closed outline: x1 plus the final x2
+    boundary_y: np.ndarray
+
+    def __len__(self):
+        return len(self.xc)
+
 # --- CORE SOLVER CLASS ---
 class PanelMethodAirfoil:
     def __init__(self, num_panels=160):
         self.num_panels = num_panels
+        # Cosine-clustered spline parameters of the panel end points (fixed per solver)
+        self.t_new = 0.5 * (1 - np.cos(np.linspace(0, np.pi, self.num_panels + 1)))
+        self._work = None      # (n, n) scratch arrays, NumPy assembly only (allocated on first use)
+        self._last_lu = None   # (panels, LU factors) of the most recent geometry
         
     def read_airfoil_dat(self, filename: str) -> Tuple[np.ndarray, np.ndarray]:
         try:
-            with open(filename, 'r') as f: lines = f.readlines()
-            x, y = [], []
-            for line in lines:
-                line = line.strip()
-                if not line or any(c.isalpha() for c in line): continue
-                parts = line.split()
-                if len(parts) >= 2:
-                    try:
-                        x.append(float(parts[0]))
-                        y.append(float(parts[1]))
-                    except ValueError: continue
-            return np.array(x), np.array(y)
+            # Selig format: optional name line, then "x y" pairs
+            with open(filename, 'r') as f: first = f.readline()
+            skip = 1 if any(c.isalpha() for c in first) else 0
+            try:
+                arr = np.loadtxt(filename, skiprows=skip, usecols=(0, 1), ndmin=2)
+            except ValueError:
+                # Stray text further down: drop every row that does not parse
+                arr = np.genfromtxt(filename, skip_header=skip, usecols=(0, 1), invalid_raise=False)
+                arr = arr.reshape(-1, 2)
+                arr = arr[~np.isnan(arr).any(axis=1)]
+            return arr[:, 0], arr[:, 1]
         except: return np.array([]), np.array([])
 
-    def create_panels(self, x: np.ndarray, y: np.ndarray) -> List[Dict]:
+    def create_panels(self, x: np.ndarray, y: np.ndarray) -> Panels:
         if not (np.isclose(x[0], x[-1]) and np.isclose(y[0], y[-1])):
             x = np.append(x, x[0])
             y = np.append(y, y[0])
@@ -41,80 +132,172 @@ class PanelMethodAirfoil:
         t_original = np.concatenate(([0], np.cumsum(dist)))
         t_original /= t_original[-1]
         
-        fx = interpolate.interp1d(t_original, x, kind='cubic')
-        fy = interpolate.interp1d(t_original, y, kind='cubic')
+        # One cubic spline through both coordinates (same not-a-knot fit as interp1d)
+        fxy = interpolate.CubicSpline(t_original, np.column_stack((x, y)))
         
-        t_new = 0.5 * (1 - np.cos(np.linspace(0, np.pi, self.num_panels + 1)))
-        x_p, y_p = fx(t_new), fy(t_new)
+        x_p, y_p = np.ascontiguousarray(fxy(self.t_new).T)
         
-        panels = []
-        for i in range(self.num_panels):
-            x1, y1, x2, y2 = x_p[i], y_p[i], x_p[i+1], y_p[i+1]
-            length = np.sqrt((x2-x1)**2 + (y2-y1)**2)
-            theta = np.arctan2(y2-y1, x2-x1)
-            panels.append({
-                'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2,
-                'xc': (x1+x2)/2, 'yc': (y1+y2)/2,
-                'length': length, 'theta': theta, 'beta': theta + np.pi/2
-            })
-        return panels
+        x1, y1, x2, y2 = x_p[:-1], y_p[:-1], x_p[1:], y_p[1:]
+        theta = np.arctan2(y2-y1, x2-x1)
+        return Panels(
+            xc=(x1+x2)/2, yc=(y1+y2)/2,
+            x1=x1, y1=y1, x2=x2, y2=y2,
+            length=np.hypot(x2-x1, y2-y1),
+            theta=theta, beta=theta + np.pi/2,
+            cos_theta=np.cos(theta), sin_theta=np.sin(theta),
+            boundary_x=x_p, boundary_y=y_p
+        )
     
-    def solve_flow(self, panels: List[Dict], alpha_deg: float, V_inf: float = 1.0) -> Dict:
-        alpha = np.radians(alpha_deg)
+    def _workspace(self, n: int) -> Dict[str, np.ndarray]:
+        """Scratch arrays for the NumPy assembly, reused while the panel count is unchanged"""
+        if self._work is None or self._work['X'].shape[0] != n:
+            self._work = {k: np.empty((n, n)) for k in ('dx', 'dy', 'X', 'Y', 'tmp')}
+        return self._work
+
+    def influence_matrix(self, panels: Panels) -> np.ndarray:
+        """Source-panel influence matrix (depends on geometry only, not on alpha)"""
+        # Rows i = control points, cols j = panels
+        xc, yc, x1, y1 = panels.xc, panels.yc, panels.x1, panels.y1
+        length = panels.length
+        ct, st = panels.cos_theta, panels.sin_theta
         n = len(panels)
-        A = np.zeros((n, n))
-        b = np.zeros(n)
+        A = np.empty((n, n))
         
-        for i, p in enumerate(panels):
-            b[i] = -V_inf * (np.cos(alpha)*np.cos(p['beta']) + np.sin(alpha)*np.sin(p['beta']))
-            
-        for i, p_i in enumerate(panels):
-            for j, p_j in enumerate(panels):
-                if i == j:
-                    A[i, j] = 0.5
-                    continue
-                X = (p_i['xc'] - p_j['x1']) * np.cos(p_j['theta']) + (p_i['yc'] - p_j['y1']) * np.sin(p_j['theta'])
-                Y = -(p_i['xc'] - p_j['x1']) * np.sin(p_j['theta']) + (p_i['yc'] - p_j['y1']) * np.cos(p_j['theta'])
-                r1_sq, r2_sq = X**2 + Y**2, (X - p_j['length'])**2 + Y**2
-                phi1, phi2 = np.arctan2(Y, X), np.arctan2(Y, X - p_j['length'])
-                vn = ((X - p_j['length'])*np.log(r2_sq + 1e-12) - X*np.log(r1_sq + 1e-12) + 2*Y*(phi2-phi1)) / (4*np.pi)
-                A[i, j] = vn / p_j['length']
-
-        try: sigma = linalg.solve(A, b)
+        if HAS_NUMBA:
+            return _assemble_A(xc, yc, x1, y1, ct, st, length, A)
+        
+        w = self._workspace(n)
+        dx, dy, X, Y, tmp = w['dx'], w['dy'], w['X'], w['Y'], w['tmp']
+        # Control point i in the local frame of panel j
+        np.subtract.outer(xc, x1, out=dx)
+        np.subtract.outer(yc, y1, out=dy)
+        np.multiply(dx, ct, out=X); X += np.multiply(dy, st, out=tmp)
+        np.multiply(dy, ct, out=Y); Y -= np.multiply(dx, st, out=tmp)
+        # dx/dy are free from here on: reuse them as Xm and r1_sq, tmp becomes r2_sq
+        Xm, r1 = dx, dy
+        np.subtract(X, length, out=Xm)
+        np.multiply(Y, Y, out=tmp)
+        np.multiply(X, X, out=r1); r1 += tmp
+        tmp += np.multiply(Xm, Xm, out=A)
+        # vn = (Xm*log(r2_sq) - X*log(r1_sq) + 2*Y*(phi2-phi1)) / (4*pi), then A = vn / length
+        np.multiply(Xm, np.log(tmp, out=tmp), out=A)
+        A -= np.multiply(X, np.log(r1, out=r1), out=r1)
+        np.arctan2(Y, Xm, out=tmp); tmp -= np.arctan2(Y, X, out=r1)
+        tmp *= Y; tmp *= 2
+        A += tmp
+        A /= (4*np.pi) * length
+        np.fill_diagonal(A, 0.5)
+        return A
+
+    def factor_influence(self, panels: Panels):
+        """LU factorization of the influence matrix, reusable for every alpha"""
+        # Only the last geometry is kept (AirfoilComparator caches factors per airfoil)
+        if self._last_lu is not None and self._last_lu[0] is panels: return self._last_lu[1]
+        # The freshly assembled matrix is factored in place and becomes the LU storage
+        A = self.influence_matrix(panels)
+        try: lu_piv = linalg.lu_factor(A, overwrite_a=True, check_finite=False)
         except: return None
+        # A singular (or non-finite) matrix only warns in lu_factor: reject it like solve did
+        diag = np.diag(lu_piv[0])
+        if np.any(diag == 0) or not np.all(np.isfinite(diag)): return None
+        self._last_lu = (panels, lu_piv)
+        return lu_piv
 
-        V_t, Cp = np.zeros(n), np.zeros(n)
-        for i, p in enumerate(panels):
-            vt_inf = V_inf * (np.cos(alpha)*-np.sin(p['beta']) + np.sin(alpha)*np.cos(p['beta']))
-            V_t[i] = vt_inf + sigma[i]/2
-            Cp[i] = 1 - (V_t[i]/V_inf)**2
-            
+    # alpha may be a scalar (-> shape (n,)) or an array of k angles (-> shape (n, k))
+    # beta = theta + pi/2, so cos(beta) = -sin(theta) and sin(beta) = cos(theta)
+    def _rhs(self, panels: Panels, alpha, V_inf: float) -> np.ndarray:
+        cb, sb = -panels.sin_theta, panels.cos_theta
+        ca, sa = np.cos(alpha), np.sin(alpha)
+        return -V_inf * (np.multiply.outer(cb, ca) + np.multiply.outer(sb, sa))
+
+    def _tangential_cp(self, panels: Panels, sigma: np.ndarray, alpha, V_inf: float) -> np.ndarray:
+        cb, sb = -panels.sin_theta, panels.cos_theta
+        ca, sa = np.cos(alpha), np.sin(alpha)
+        vt_inf = V_inf * (np.multiply.outer(-sb, ca) + np.multiply.outer(cb, sa))
+        V_t = vt_inf + sigma/2
+        return 1 - (V_t/V_inf)**2
+
+    def _surface_solution(self, panels: Panels, sigma: np.ndarray, alpha: float, V_inf: float) -> Dict:
+        Cp = self._tangential_cp(panels, sigma, alpha, V_inf)
         return {'sigma': sigma, 'Cp': Cp, 'panels': panels}
 
-    def compute_flow_field(self, result: Dict, alpha_deg: float, res: int = 50):
+    def solve_flow(self, panels: Panels, alpha_deg: float, V_inf: float = 1.0) -> Dict:
+        lu_piv = self.factor_influence(panels)
+        if lu_piv is None: return None
+        return self.solve_flow_cached(panels, lu_piv, alpha_deg, V_inf)
+
+    def solve_flow_cached(self, panels: Panels, lu_piv, alpha_deg: float, V_inf: float = 1.0) -> Dict:
+        """Same as solve_flow, but back-substitutes with a precomputed LU (see factor_influence)"""
+        alpha = np.radians(alpha_deg)
+        b = self._rhs(panels, alpha, V_inf)
+        sigma = linalg.lu_solve(lu_piv, b, overwrite_b=True, check_finite=False)
+        return self._surface_solution(panels, sigma, alpha, V_inf)
+
+    def solve_flow_batch(self, panels: Panels, alphas_deg: List[float], V_inf: float = 1.0,
+                         lu_piv=None) -> Dict[float, Dict]:
+        """
+        Solves every alpha in one LAPACK call: the RHS columns are stacked into
+        an (n, len(alphas)) matrix and back-substituted against a single LU.
+        Returns {alpha_deg: result} with the same result layout as solve_flow.
+        """
+        if lu_piv is None: lu_piv = self.factor_influence(panels)
+        if lu_piv is None: return {}
+        
+        alphas = np.radians(np.asarray(alphas_deg, dtype=float))
+        B = self._rhs(panels, alphas, V_inf)
+        sigma_mat = linalg.lu_solve(lu_piv, B, overwrite_b=True, check_finite=False)
+        Cp_mat = self._tangential_cp(panels, sigma_mat, alphas, V_inf)
+        
+        return {a: {'sigma': sigma_mat[:, k], 'Cp': Cp_mat[:, k], 'panels': panels}
+                for k, a in enumerate(alphas_deg)}
+
+    def compute_flow_field(self, result: Dict, alpha_deg: float, res: int = 50, dtype=np.float32):
+        """Velocity and Cp on a res x res grid; dtype is the evaluation precision (float32 is plenty for plots)"""
         alpha = np.radians(alpha_deg)
         panels = result['panels']
-        sigma = result['sigma']
+        # The solve stays float64; only the field evaluation runs in the requested dtype
+        sigma = result['sigma'].astype(dtype, copy=False)
+        x1, y1 = panels.x1.astype(dtype, copy=False), panels.y1.astype(dtype, copy=False)
+        cos_t, sin_t = panels.cos_theta.astype(dtype, copy=False), panels.sin_theta.astype(dtype, copy=False)
+        lengths = panels.length.astype(dtype, copy=False)
         
-        x = np.linspace(-0.5, 1.5, res)
-        y = np.linspace(-0.6, 0.6, res)
+        x = np.linspace(-0.5, 1.5, res, dtype=dtype)
+        y = np.linspace(-0.6, 0.6, res, dtype=dtype)
         X, Y = np.meshgrid(x, y)
         
-        U = np.ones_like(X) * np.cos(alpha)
-        V = np.ones_like(Y) * np.sin(alpha)
+        ca, sa = np.cos(alpha), np.sin(alpha)
+        U = np.full_like(X, ca)
+        V = np.full_like(Y, sa)
         
-        for k, p in enumerate(panels):
-            dx, dy = X - p['x1'], Y - p['y1']
-            X_loc = dx * np.cos(p['theta']) + dy * np.sin(p['theta'])
-            Y_loc = -dx * np.sin(p['theta']) + dy * np.cos(p['theta'])
-            r1_sq, r2_sq = X_loc**2 + Y_loc**2, (X_loc - p['length'])**2 + Y_loc**2
-            theta1, theta2 = np.arctan2(Y_loc, X_loc), np.arctan2(Y_loc, X_loc - p['length'])
-            J = 0.5 * np.log((r2_sq + 1e-10)/(r1_sq + 1e-10))
-            I = theta2 - theta1
-            
-            u_loc = (J*np.cos(p['theta']) - I*np.sin(p['theta'])) * sigma[k]/(2*np.pi)
-            v_loc = (J*np.sin(p['theta']) + I*np.cos(p['theta'])) * sigma[k]/(2*np.pi)
-            U += u_loc; V += v_loc
+        U_flat, V_flat = U.reshape(-1), V.reshape(-1)
+        if HAS_NUMBA:
+            u_ind, v_ind = _field_eval(X.ravel(), Y.ravel(), x1, y1, cos_t, sin_t, lengths, sigma)
+            U_flat += u_ind
+            V_flat += v_ind
+        else:
+            # Grid points as rows (G, 1), panels as columns (1, n); the panel
+            # axis is processed in blocks to keep the (G, n) temporaries small
+            Xf, Yf = X.reshape(-1, 1), Y.reshape(-1, 1)
+            block = 32
+            for s in range(0, len(panels), block):
+                sl = slice(s, s + block)
+                ct, st, length = cos_t[sl], sin_t[sl], lengths[sl]
+                dx, dy = Xf - x1[sl], Yf - y1[sl]
+                X_loc = dx * ct + dy * st
+                Y_loc = -dx * st + dy * ct
+                Xm = X_loc - length
+                r1_sq, r2_sq = X_loc**2 + Y_loc**2, Xm**2 + Y_loc**2
+                # J and I are built in place on the radius/angle temporaries
+                J = np.log(np.maximum(r2_sq, 1e-20, out=r2_sq) / np.maximum(r1_sq, 1e-20, out=r1_sq), out=r2_sq)
+                J *= 0.5
+                I = np.arctan2(Y_loc, Xm, out=Xm)
+                I -= np.arctan2(Y_loc, X_loc, out=X_loc)
+                
+                # sum over panels of (J*ct - I*st)*coef etc. as matrix-vector products
+                coef = sigma[sl]/(2*np.pi)
+                cc, sc = ct * coef, st * coef
+                U_flat += J @ cc - I @ sc
+                V_flat += J @ sc + I @ cc
             
         V_mag = np.sqrt(U**2 + V**2)
         Cp_field = 1 - V_mag**2
@@ -127,26 +310,25 @@ class PanelMethodAirfoil:
             print(f"    ⚠️ File not found: {polar_path}")
             return None
         try:
-            data = []
-            with open(polar_path, 'r') as f: lines = f.readlines()
-            parsing = False
-            for line in lines:
-                if "---" in line: parsing = True; continue
-                if parsing and line.strip():
-                    try:
-                        p = line.split()
-                        if len(p) < 5: continue 
-                        data.append({
-                            'alpha': float(p[0]), 'CL': float(p[1]), 
-                            'CD': float(p[2]), 'CM': float(p[4]),
-                            'L/D': float(p[1])/float(p[2]) if float(p[2])!=0 else 0
-                        })
-                    except: continue
-            if not data: 
+            # Data starts after the "------ --------" separator line
+            header_end = None
+            with open(polar_path, 'r') as f:
+                for i, line in enumerate(f):
+                    if "---" in line: header_end = i + 1; break
+            
+            df = None
+            if header_end is not None:
+                try:
+                    df = pd.read_csv(polar_path, sep=r"\s+", skiprows=header_end, header=None,
+                                     usecols=[0, 1, 2, 4], engine='c')
+                    df.columns = ['alpha', 'CL', 'CD', 'CM']
+                except pd.errors.EmptyDataError: pass
+            if df is None or df.empty: 
                 print(f"    ⚠️ File exists but parsed 0 points: {airfoil_name}")
                 return None
-            print(f"    ✅ Loaded {len(data)} XFOIL points for {airfoil_name}")
-            return pd.DataFrame(data).sort_values('alpha')
+            df['L/D'] = np.where(df['CD'] != 0, df['CL'] / df['CD'], 0.0)
+            print(f"    ✅ Loaded {len(df)} XFOIL points for {airfoil_name}")
+            return df.sort_values('alpha', kind='mergesort')
         except Exception as e: 
             print(f"    ❌ Error reading {airfoil_name}: {e}")
             return None
@@ -160,17 +342,86 @@ class AirfoilComparator:
         self.solver = PanelMethodAirfoil(num_panels=160)
         self.loaded_geometries = {}
         self.loaded_polars = {}
+        self.cached_panels = {}
+        self.cached_lu = {}
+        self.solutions = {}  # (name, alpha) -> solver result, see precompute_solutions
+        # Figures reused across plots of the same kind (created lazily, see close_figures)
+        self._field_figs = {}
+        self._colorbars = {}
+        self._metric_fig = self._metric_ax = None
         
         print("\n--- Loading Data ---")
         for name in airfoils:
             path = os.path.join(data_dir, f"{name}.dat")
             if os.path.exists(path):
                 self.loaded_geometries[name] = self.solver.read_airfoil_dat(path)
+                # Panels and the LU of the influence matrix depend only on geometry
+                self.cached_lu[name] = self.solver.factor_influence(self._panels_for(name))
             
             polar = self.solver.load_xfoil_polar(name)
             if polar is not None:
                 self.loaded_polars[name] = polar
 
+    def precompute_solutions(self, alphas: List[float]):
+        """Batch-solves all alphas for every airfoil (one multi-RHS solve each)"""
+        for name, panels in self.cached_panels.items():
+            batch = self.solver.solve_flow_batch(panels, alphas, lu_piv=self.cached_lu[name])
+            for alpha, res in batch.items():
+                self.solutions[(name, alpha)] = res
+
+    def _panels_for(self, name: str) -> Panels:
+        """Panels of one airfoil, built from its geometry on first request only"""
+        if name not in self.cached_panels:
+            self.cached_panels[name] = self.solver.create_panels(*self.loaded_geometries[name])
+        return self.cached_panels[name]
+
+    def _solve(self, name: str, alpha: float):
+        """Panel solution for one airfoil, reusing its cached panels and LU factors"""
+        if (name, alpha) in self.solutions: return self.solutions[(name, alpha)]
+        lu_piv = self.cached_lu.get(name)
+        if lu_piv is None: return None
+        return self.solver.solve_flow_cached(self._panels_for(name), lu_piv, alpha_deg=alpha)
+
+    def __getstate__(self):
+        # Figures stay with the process that drew them; workers build their own
+        state = self.__dict__.copy()
+        state.update(_field_figs={}, _colorbars={}, _metric_fig=None, _metric_ax=None)
+        return state
+
+    def close_figures(self):
+        """Releases the reused figures (call once all plots are written)"""
+        for fig, _ in self._field_figs.values(): plt.close(fig)
+        if self._metric_fig is not None: plt.close(self._metric_fig)
+        self._field_figs, self._colorbars = {}, {}
+        self._metric_fig = self._metric_ax = None
+
+    def _field_canvas(self, plot_type: str):
+        """One 4x2 figure per field type, created on first use and reused across alphas"""
+        if plot_type not in self._field_figs:
+            fig, axes = plt.subplots(4, 2, figsize=(16, 16))
+            # Fixed margins set once, before any colorbar takes its share of the figure
+            fig.subplots_adjust(**GRID_LAYOUT)
+            self._field_figs[plot_type] = (fig, axes)
+        return self._field_figs[plot_type]
+
+    def _metric_canvas(self):
+        if self._metric_fig is None:
+            self._metric_fig, self._metric_ax = plt.subplots(figsize=(10, 7))
+        return self._metric_fig, self._metric_ax
+
+    def render_alphas(self, alphas: List[float]):
+        """Renders a batch of alphas in one process so the reused figures persist"""
+        for alpha in alphas: self.render_alpha(alpha)
+        self.close_figures()
+
+    def render_alpha(self, alpha: float):
+        """All flow plots for one angle of attack (independent of other alphas)"""
+        print(f"\nProcessing Alpha = {alpha}...")
+        self.plot_overlapped_cp(alpha)
+        self.plot_field_grid(alpha, 'streamlines')
+        self.plot_field_grid(alpha, 'velocity')
+        self.plot_field_grid(alpha, 'pressure')
+
     # --- PLOT TYPE 1: GEOMETRY GRID ---
     def plot_geometry_comparison_grid(self):
         print("  Generating Geometry Grid...")
@@ -193,8 +444,7 @@ class AirfoilComparator:
             else: ax.set_yticks([])
 
         for j in range(len(self.airfoils), rows*cols): axes_flat[j].axis('off')
-        try: plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-        except: pass
+        fig.subplots_adjust(**GRID_LAYOUT)
         plt.savefig(os.path.join(self.output_dir, "Comparison_Grid_Geometry.png"), dpi=200)
         plt.close()
 
@@ -204,20 +454,20 @@ class AirfoilComparator:
         print(f"  Generating {filename}...")
         if not self.loaded_polars: return
         
-        plt.figure(figsize=(10, 7))
+        fig, ax = self._metric_canvas()
+        ax.cla()
         
         for name, df in self.loaded_polars.items():
             # Plot ALL available XFOIL data points
-            plt.plot(df[x_key], df[y_key], 'o-', markersize=4, linewidth=1.5, label=name)
+            ax.plot(df[x_key], df[y_key], 'o-', markersize=4, linewidth=1.5, label=name)
             
-        plt.title(title, fontsize=14)
-        plt.xlabel(xlabel)
-        plt.ylabel(ylabel)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
+        ax.set_title(title, fontsize=14)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+        ax.legend()
         
-        plt.savefig(os.path.join(self.output_dir, filename), dpi=300)
-        plt.close()
+        fig.savefig(os.path.join(self.output_dir, filename), dpi=PLOT_DPI, pil_kwargs=PNG_KWARGS)
 
     def plot_all_performance_metrics(self):
         # Calls the generic function for each specific graph you need
@@ -230,49 +480,53 @@ class AirfoilComparator:
     # --- PLOT TYPE 3: CP LINE GRAPH ---
     def plot_overlapped_cp(self, alpha: float):
         plt.figure(figsize=(12, 8))
-        for name, (x, y) in self.loaded_geometries.items():
-            panels = self.solver.create_panels(x, y)
-            res = self.solver.solve_flow(panels, alpha_deg=alpha)
+        for name in self.loaded_geometries:
+            res = self._solve(name, alpha)
             if res:
-                xc = [p['xc'] for p in panels]
-                plt.plot(xc, res['Cp'], linewidth=1.5, label=name)
+                panels = res['panels']
+                plt.plot(panels.xc, res['Cp'], linewidth=1.5, label=name)
 
         plt.gca().invert_yaxis()
         plt.title(f"Surface Pressure Comparison @ {alpha}°")
         plt.xlabel("x/c"); plt.ylabel("-Cp")
         plt.grid(True, alpha=0.3); plt.legend()
-        plt.savefig(os.path.join(self.output_dir, f"Comp_Line_Cp_a{alpha}.png"), dpi=200)
+        plt.savefig(os.path.join(self.output_dir, f"Comp_Line_Cp_a{alpha}.png"), dpi=PLOT_DPI, pil_kwargs=PNG_KWARGS)
         plt.close()
 
     # --- PLOT TYPE 4: FLOW FIELD GRIDS ---
     def plot_field_grid(self, alpha: float, plot_type: str):
         print(f"  Generating {plot_type} grid for Alpha {alpha}...")
         rows, cols = 4, 2
-        fig, axes = plt.subplots(rows, cols, figsize=(16, 16))
+        fig, axes = self._field_canvas(plot_type)
         axes_flat = axes.flatten()
+        for ax in axes_flat: ax.cla()
         fig.suptitle(f"Comparison of {plot_type.title()} @ Alpha = {alpha}°", fontsize=16)
         
         for i, name in enumerate(self.airfoils):
             if name not in self.loaded_geometries: continue
             ax = axes_flat[i]
-            x, y = self.loaded_geometries[name]
-            panels = self.solver.create_panels(x, y)
-            res = self.solver.solve_flow(panels, alpha_deg=alpha)
+            res = self._solve(name, alpha)
             
             if res:
+                panels = res['panels']
                 ff = self.solver.compute_flow_field(res, alpha_deg=alpha, res=60)
-                xp = [p['x1'] for p in panels] + [panels[-1]['x2']]
-                yp = [p['y1'] for p in panels] + [panels[-1]['y2']]
+                xp, yp = panels.boundary_x, panels.boundary_y
                 
                 if plot_type == 'streamlines':
                     ax.streamplot(ff['X'], ff['Y'], ff['U'], ff['V'], density=1.0, color='b', linewidth=0.6)
                     ax.fill(xp, yp, 'k', zorder=10)
                 elif plot_type == 'velocity':
                     c = ax.contourf(ff['X'], ff['Y'], ff['V_mag'], levels=40, cmap='viridis')
+                    c.set_rasterized(True)
                     ax.fill(xp, yp, 'w', zorder=10)
-                    if i == 1: plt.colorbar(c, ax=axes, fraction=0.02, pad=0.04)
+                    if i == 1:
+                        cbar = self._colorbars.get(plot_type)
+                        if cbar is None:
+                            self._colorbars[plot_type] = fig.colorbar(c, ax=axes, fraction=0.02, pad=0.04)
+                        else: cbar.update_normal(c)
                 elif plot_type == 'pressure':
                     c = ax.contourf(ff['X'], ff['Y'], ff['Cp'], levels=40, cmap='jet')
+                    c.set_rasterized(True)
                     ax.fill(xp, yp, 'w', zorder=10)
                     
                 ax.plot(xp, yp, 'k-', linewidth=1)
@@ -281,10 +535,12 @@ class AirfoilComparator:
                 ax.set_xticks([]); ax.set_yticks([])
 
         for j in range(len(self.airfoils), rows*cols): axes_flat[j].axis('off')
-        try: plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-        except: pass
-        plt.savefig(os.path.join(self.output_dir, f"Comp_Grid_{plot_type.title()}_a{alpha}.png"), dpi=200)
-        plt.close()
+        fig.savefig(os.path.join(self.output_dir, f"Comp_Grid_{plot_type.title()}_a{alpha}.png"),
+                    dpi=PLOT_DPI, pil_kwargs=PNG_KWARGS)
+
+def _init_plot_worker(n_threads: int):
+    """Splits the cores between plot workers so their Numba thread pools don't oversubscribe"""
+    if HAS_NUMBA: set_num_threads(n_threads)
 
 if __name__ == "__main__":
     base_dir = os.getcwd()
@@ -301,6 +557,7 @@ if __name__ == "__main__":
     comparison_alphas = [-4, -2, 0, 2, 4, 6, 8, 10, 12]
     
     comparator = AirfoilComparator(airfoils, data_dir, output_dir)
+    comparator.precompute_solutions(comparison_alphas)
     
     print("--- Starting Plot Generation ---")
     
@@ -309,13 +566,16 @@ if __name__ == "__main__":
     
     # 2. SEPARATED Performance Plots (The feature you requested)
     comparator.plot_all_performance_metrics()
+    comparator.close_figures()
     
-    # 3. Loop through ALL angles for Flow Fields
-    for alpha in comparison_alphas:
-        print(f"\nProcessing Alpha = {alpha}...")
-        comparator.plot_overlapped_cp(alpha)
-        comparator.plot_field_grid(alpha, 'streamlines')
-        comparator.plot_field_grid(alpha, 'velocity')
-        comparator.plot_field_grid(alpha, 'pressure')
+    # 3. Flow Fields for ALL angles (alphas are dealt round-robin, one batch per worker)
+    n_workers = min(os.cpu_count() or 1, len(comparison_alphas))
+    alpha_batches = [comparison_alphas[i::n_workers] for i in range(n_workers)]
+    threads_per_worker = max(1, (os.cpu_count() or 1) // n_workers)
+    # 'spawn' keeps the Numba thread pool out of forked children (not fork-safe)
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_plot_worker, initargs=(threads_per_worker,)) as ex:
+        list(ex.map(comparator.render_alphas, alpha_batches))
 
     print(f"\n✅ All plots saved to: {output_dir}")
\ No newline at end of file